@@ -0,0 +1,257 @@
+"""
+Autotuner por máquina para el generador de Mandelbrot.
+
+Ejecuta renders cortos de calibración y elige el backend más rápido
+(secuencial, hilos, procesos o vectorizado), el número de trabajadores y el
+tamaño de bloque (filas por bloque) para una resolución y max_iter dados.
+La elección se guarda en un perfil por host y se reutiliza hasta que cambie
+el hardware o la versión del código.
+
+Uso:
+    python3 autotuner.py [ANCHO ALTO MAX_ITER] [--forzar]
+"""
+
+import hashlib
+import json
+import os
+import platform
+import socket
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import traza
+from mandelbrot_multihilo_color import generar_mandelbrot_multihilo
+from mandelbrot_utils import calcular_filas, calcular_filas_vectorizado, guardar_imagen_color
+from pool_trabajadores import obtener_pool
+
+BACKENDS = ("secuencial", "hilos", "procesos", "vectorizado")
+
+# Los renders de calibración se reducen a este número de pixels como máximo
+PIXELES_CALIBRACION = 40_000
+REPETICIONES_CALIBRACION = 2
+# Candidatos de tamaño de bloque, expresados en bloques por trabajador
+BLOQUES_POR_TRABAJADOR = (1, 4, 16)
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+# Archivos cuyo contenido define la "versión del código" del perfil
+ARCHIVOS_CODIGO = ("mandelbrot_utils.py", "formulas.py", "pool_trabajadores.py",
+                   "mandelbrot_multihilo_color.py", "autotuner.py")
+
+# Viewport de referencia (el mismo que usan los generadores)
+VIEWPORT = (-2.5, 1.0, -1.0, 1.0)
+
+def _renderizar_por_bloques(funcion, num_trabajadores, filas_por_bloque, ancho, alto,
+                            x_min, x_max, y_min, y_max, max_iter):
+    """Reparte bloques de filas entre hilos y ensambla la imagen."""
+    rangos = [(f, min(alto, f + filas_por_bloque)) for f in range(0, alto, filas_por_bloque)]
+
+    def procesar(rango):
+        with traza.tramo(f"Filas {rango[0]}-{rango[1]-1}", "tile"):
+            return funcion(rango[0], rango[1], ancho, alto, x_min, x_max, y_min, y_max, max_iter)
+
+    imagen = np.zeros((alto, ancho))
+    with ThreadPoolExecutor(max_workers=num_trabajadores) as executor:
+        bloques = executor.map(procesar, rangos)
+        for (fila_inicio, fila_fin), bloque in zip(rangos, bloques):
+            imagen[fila_inicio:fila_fin] = bloque
+    return imagen
+
+def renderizar(backend, num_trabajadores, filas_por_bloque, ancho, alto,
+               x_min, x_max, y_min, y_max, max_iter):
+    """Genera la imagen con el backend y parámetros indicados."""
+    if backend == "secuencial":
+        return calcular_filas(0, alto, ancho, alto, x_min, x_max, y_min, y_max, max_iter)
+    if backend == "hilos":
+        # El mismo generador (y reparto de bloques) que mandelbrot_multihilo_color.py
+        return generar_mandelbrot_multihilo(ancho, alto, x_min, x_max, y_min, y_max, max_iter,
+                                            num_trabajadores, filas_por_bloque, verbose=False)
+    if backend == "procesos":
+        return obtener_pool(num_trabajadores).renderizar(
+            ancho, alto, x_min, x_max, y_min, y_max, max_iter, filas_por_bloque)
+    if backend == "vectorizado":
+        if num_trabajadores == 1:
+            return calcular_filas_vectorizado(0, alto, ancho, alto, x_min, x_max, y_min, y_max, max_iter)
+        return _renderizar_por_bloques(calcular_filas_vectorizado, num_trabajadores, filas_por_bloque,
+                                       ancho, alto, x_min, x_max, y_min, y_max, max_iter)
+    raise ValueError(f"Backend desconocido: {backend}")
+
+def _candidatos_trabajadores():
+    """Potencias de 2 hasta el número de CPUs, más el número de CPUs."""
+    cpus = os.cpu_count() or 1
+    candidatos = {cpus}
+    n = 1
+    while n < cpus:
+        candidatos.add(n)
+        n *= 2
+    return sorted(candidatos)
+
+def _candidatos(backend):
+    """Devuelve las combinaciones (trabajadores, bloques por trabajador) a probar."""
+    if backend == "secuencial":
+        return [(1, 1)]
+    trabajadores = _candidatos_trabajadores()
+    if backend == "hilos":
+        trabajadores = [w for w in trabajadores if w > 1] or [2]
+    candidatos = [(w, b) for w in trabajadores for b in BLOQUES_POR_TRABAJADOR]
+    if backend == "vectorizado":
+        # Con un solo trabajador se calcula la imagen entera de una vez
+        candidatos = [(w, b) for w, b in candidatos if w > 1] + [(1, 1)]
+    return candidatos
+
+def _filas_por_bloque(alto, num_trabajadores, bloques_por_trabajador):
+    return max(1, alto // (num_trabajadores * bloques_por_trabajador))
+
+def _resolucion_calibracion(ancho, alto):
+    """Reduce la resolución conservando la proporción hasta PIXELES_CALIBRACION."""
+    escala = min(1.0, (PIXELES_CALIBRACION / (ancho * alto)) ** 0.5)
+    return max(1, int(ancho * escala)), max(1, int(alto * escala))
+
+def _medir(backend, num_trabajadores, bloques_por_trabajador, ancho, alto, max_iter):
+    """Mejor tiempo de REPETICIONES_CALIBRACION renders de calibración."""
+    filas = _filas_por_bloque(alto, num_trabajadores, bloques_por_trabajador)
+    if backend == "procesos":
+        obtener_pool(num_trabajadores)  # el arranque del pool no se mide
+    mejor = float("inf")
+    for _ in range(REPETICIONES_CALIBRACION):
+        inicio = time.perf_counter()
+        renderizar(backend, num_trabajadores, filas, ancho, alto, *VIEWPORT, max_iter)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+def calibrar(ancho, alto, max_iter, backends=BACKENDS, verbose=True):
+    """
+    Prueba cada backend con sus candidatos y devuelve la mejor configuración
+    de cada uno, con el tamaño de bloque ya escalado a la resolución real.
+    """
+    ancho_cal, alto_cal = _resolucion_calibracion(ancho, alto)
+    if verbose:
+        print(f"Calibrando {ancho}x{alto} (max_iter={max_iter}) "
+              f"con renders de {ancho_cal}x{alto_cal}...")
+
+    resultados = {}
+    for backend in backends:
+        mejor = None
+        for num_trabajadores, bloques in _candidatos(backend):
+            # Los renders de calibración no deben aparecer en la traza del render real
+            with traza.pausada():
+                tiempo = _medir(backend, num_trabajadores, bloques, ancho_cal, alto_cal, max_iter)
+            if verbose:
+                print(f"  {backend:<12} trabajadores={num_trabajadores:<3} "
+                      f"bloques/trabajador={bloques:<3} {tiempo*1000:8.1f} ms")
+            if mejor is None or tiempo < mejor["tiempo_calibracion"]:
+                mejor = {
+                    "num_trabajadores": num_trabajadores,
+                    "filas_por_bloque": _filas_por_bloque(alto, num_trabajadores, bloques),
+                    "tiempo_calibracion": tiempo,
+                }
+        resultados[backend] = mejor
+    return resultados
+
+def huella_maquina():
+    """Identifica el hardware, el entorno y la versión del código."""
+    sha = hashlib.sha1()
+    for nombre in ARCHIVOS_CODIGO:
+        with open(os.path.join(DIRECTORIO, nombre), "rb") as f:
+            sha.update(f.read())
+    return {
+        "host": socket.gethostname(),
+        "maquina": platform.machine(),
+        "procesador": platform.processor(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "version_codigo": sha.hexdigest(),
+    }
+
+def ruta_perfil():
+    """Ruta del perfil de este host (configurable con MANDELBROT_PERFIL_DIR)."""
+    directorio = os.environ.get(
+        "MANDELBROT_PERFIL_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "mandelbrot")
+    )
+    return os.path.join(directorio, f"perfil_{socket.gethostname()}.json")
+
+def cargar_perfil():
+    """Carga el perfil del host; lo descarta si la huella ya no coincide."""
+    huella = huella_maquina()
+    try:
+        with open(ruta_perfil()) as f:
+            perfil = json.load(f)
+    except (OSError, ValueError):
+        perfil = None
+    if not perfil or perfil.get("huella") != huella:
+        perfil = {"huella": huella, "configuraciones": {}}
+    return perfil
+
+def guardar_perfil(perfil):
+    ruta = ruta_perfil()
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with open(ruta, "w") as f:
+        json.dump(perfil, f, indent=2)
+
+def obtener_configuracion(ancho, alto, max_iter, backends=BACKENDS, forzar=False, verbose=True):
+    """
+    Devuelve la configuración más rápida entre los backends pedidos:
+    {'backend', 'num_trabajadores', 'filas_por_bloque', 'tiempo_calibracion'}.
+
+    Solo calibra los backends que aún no están en el perfil para esta
+    resolución y max_iter (o todos si forzar=True).
+    """
+    perfil = cargar_perfil()
+    clave = f"{ancho}x{alto}@{max_iter}"
+    guardados = {} if forzar else perfil["configuraciones"].get(clave, {})
+
+    faltantes = [b for b in backends if b not in guardados]
+    if faltantes:
+        guardados.update(calibrar(ancho, alto, max_iter, faltantes, verbose))
+        perfil["configuraciones"][clave] = guardados
+        guardar_perfil(perfil)
+
+    backend = min(backends, key=lambda b: guardados[b]["tiempo_calibracion"])
+    return dict(guardados[backend], backend=backend)
+
+def renderizar_autoajustado(ancho, alto, x_min, x_max, y_min, y_max, max_iter,
+                            backends=BACKENDS, verbose=True):
+    """
+    Genera la imagen con el backend, trabajadores y tamaño de bloque que el
+    perfil de esta máquina indica como más rápidos (calibrando si hace falta).
+    Devuelve (imagen, configuración usada).
+    """
+    config = obtener_configuracion(ancho, alto, max_iter, backends, verbose=verbose)
+    imagen = renderizar(config["backend"], config["num_trabajadores"], config["filas_por_bloque"],
+                        ancho, alto, x_min, x_max, y_min, y_max, max_iter)
+    return imagen, config
+
+if __name__ == "__main__":
+    argumentos = [a for a in sys.argv[1:] if not a.startswith("--")]
+    forzar = "--forzar" in sys.argv
+    if argumentos:
+        ANCHO, ALTO, MAX_ITER = (int(a) for a in argumentos[:3])
+    else:
+        ANCHO, ALTO, MAX_ITER = 1920, 1080, 256
+
+    print("="*70)
+    print("AUTOTUNER DE MANDELBROT")
+    print("="*70)
+
+    config = obtener_configuracion(ANCHO, ALTO, MAX_ITER, forzar=forzar)
+
+    print("-"*70)
+    print(f"Backend elegido: {config['backend']}")
+    print(f"Trabajadores: {config['num_trabajadores']}")
+    print(f"Filas por bloque: {config['filas_por_bloque']}")
+    print(f"Perfil guardado en: {ruta_perfil()}")
+    print("-"*70)
+
+    # Render completo con la configuración elegida
+    inicio = time.time()
+    resultado, _ = renderizar_autoajustado(ANCHO, ALTO, *VIEWPORT, MAX_ITER, verbose=False)
+    tiempo_total = time.time() - inicio
+    guardar_imagen_color(resultado, f"mandelbrot_{config['backend']}_color.png")
+
+    print(f"TIEMPO TOTAL DE EJECUCIÓN: {tiempo_total:.2f} segundos")
+    print(f"Pixels por segundo: {(ANCHO * ALTO) / tiempo_total:,.0f}")
+    print("="*70)
@@ -0,0 +1,83 @@
+"""
+Benchmark del costo de arranque.
+
+Mide cuánto cuesta levantar un intérprete nuevo con las importaciones del
+proyecto y compara un render pequeño lanzado en un proceso nuevo (en frío)
+contra el mismo render en el pool persistente de trabajadores (en caliente).
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from pool_trabajadores import PoolMandelbrot
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+def medir_comando(codigo, repeticiones):
+    """Ejecuta 'python -c codigo' varias veces y devuelve la mediana en segundos."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, "-c", codigo], cwd=DIRECTORIO, check=True)
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+def medir_pool(pool, parametros, repeticiones):
+    """
+    Ejecuta el render en el pool caliente varias veces y devuelve la mediana.
+    parametros son los argumentos de PoolMandelbrot.renderizar.
+    """
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        pool.renderizar(*parametros)
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+def main():
+    REPETICIONES = 5
+    # Render pequeño: aquí el arranque pesa más que el cálculo
+    ANCHO, ALTO, MAX_ITER = 160, 90, 64
+    parametros = (ANCHO, ALTO, -2.5, 1.0, -1.0, 1.0, MAX_ITER)
+
+    print("="*70)
+    print("BENCHMARK DE ARRANQUE")
+    print("="*70)
+    print(f"Render de prueba: {ANCHO}x{ALTO}, max_iter={MAX_ITER}")
+    print(f"Repeticiones por medida: {REPETICIONES} (se reporta la mediana)\n")
+
+    t_vacio = medir_comando("pass", REPETICIONES)
+    t_nucleo = medir_comando("import mandelbrot_utils", REPETICIONES)
+    t_pil = medir_comando("import mandelbrot_utils; import PIL.Image", REPETICIONES)
+    t_frio = medir_comando(
+        "from mandelbrot_utils import calcular_filas; "
+        f"calcular_filas(0, {ALTO}, {ANCHO}, {ALTO}, -2.5, 1.0, -1.0, 1.0, {MAX_ITER})",
+        REPETICIONES
+    )
+
+    # Mismo trabajo y paralelismo que en frío (1 proceso, un solo bloque):
+    # la diferencia es solo el costo de arranque
+    inicio = time.perf_counter()
+    with PoolMandelbrot(1) as pool:
+        pool.calentar()
+        t_creacion_pool = time.perf_counter() - inicio
+        t_caliente = medir_pool(pool, parametros + (ALTO,), REPETICIONES)
+
+    print(f"{'Medida':<45} {'Tiempo (ms)':<15}")
+    print("-"*70)
+    print(f"{'Intérprete vacío':<45} {t_vacio*1000:<15.1f}")
+    print(f"{'Intérprete + núcleo (numpy, sin PIL)':<45} {t_nucleo*1000:<15.1f}")
+    print(f"{'Intérprete + núcleo + PIL':<45} {t_pil*1000:<15.1f}")
+    print(f"{'Render en proceso nuevo (frío)':<45} {t_frio*1000:<15.1f}")
+    print(f"{'Creación del pool (una sola vez)':<45} {t_creacion_pool*1000:<15.1f}")
+    print(f"{'Render en pool persistente (caliente)':<45} {t_caliente*1000:<15.1f}")
+    print("-"*70)
+    print(f"\nAhorro por no importar PIL: {(t_pil - t_nucleo)*1000:.1f} ms por proceso")
+    print(f"Speedup caliente vs frío: {t_frio / t_caliente:.2f}x")
+    print("="*70)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Capa de formatos de salida para las imágenes del fractal.
+
+Formatos disponibles (se eligen por extensión o con el parámetro formato):
+
+- 'png'        PNG RGB de 24 bits a través de PIL (el formato original).
+- 'png_paleta' PNG de 8 bits con paleta, generado directo desde la matriz
+               de iteraciones (unas 3 veces más pequeño que el RGB).
+- 'png_rgb'    PNG RGB con el codificador por trozos paralelo.
+- 'npy'        Matriz de iteraciones cruda (numpy), para recolorear luego.
+- 'npz'        Volcado comprimido de iteraciones con metadatos (viewport,
+               max_iter...), también para recolorear luego.
+- 'pil'        Cualquier otra extensión que soporte PIL (.jpg, .bmp...), en
+               RGB; es lo que se usa si la extensión no es .png/.npy/.npz.
+
+Los PNG propios se codifican por trozos: la imagen se divide en franjas de
+filas que se comprimen en paralelo (zlib libera el GIL) y los flujos deflate
+se concatenan, igual que hace pigz. Todas las funciones devuelven un informe
+{'formato', 'ruta', 'bytes', 'tiempo_codificacion'}.
+
+Uso (comparación de formatos):
+    python3 formatos.py
+"""
+
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from mandelbrot_utils import colorear
+
+NIVEL_COMPRESION_POR_DEFECTO = 6
+FIRMA_PNG = b"\x89PNG\r\n\x1a\n"
+# Byte FLG de la cabecera zlib (obligatorio): FLEVEL según el nivel y FCHECK
+# para que 0x78 * 256 + FLG sea múltiplo de 31
+_FLG_ZLIB = {0: 0x01, 1: 0x01, 2: 0x5E, 3: 0x5E, 4: 0x5E, 5: 0x5E, 6: 0x9C, 7: 0xDA, 8: 0xDA, 9: 0xDA}
+
+EXTENSIONES = {".png": "png", ".npy": "npy", ".npz": "npz"}
+
+def _informe(formato, ruta, inicio):
+    return {
+        "formato": formato,
+        "ruta": ruta,
+        "bytes": os.path.getsize(ruta),
+        "tiempo_codificacion": time.perf_counter() - inicio,
+    }
+
+def _validar_nivel(nivel_compresion):
+    """Nivel de compresión 0-9; -1 (Z_DEFAULT_COMPRESSION de zlib) equivale a 6."""
+    if nivel_compresion == zlib.Z_DEFAULT_COMPRESSION:
+        return 6
+    if nivel_compresion not in _FLG_ZLIB:
+        raise ValueError(f"Nivel de compresión inválido: {nivel_compresion} (debe ser 0-9 o -1)")
+    return nivel_compresion
+
+def _chunk_png(tipo, datos):
+    """Empaqueta un chunk PNG: longitud, tipo, datos y CRC."""
+    return struct.pack(">I", len(datos)) + tipo + datos + struct.pack(">I", zlib.crc32(tipo + datos))
+
+def _comprimir_trozo(datos, nivel, ultimo):
+    """
+    Comprime un trozo como deflate crudo. Los trozos intermedios terminan con
+    Z_SYNC_FLUSH (alineados a byte, sin bloque final) para poder concatenarlos.
+    """
+    compresor = zlib.compressobj(nivel, zlib.DEFLATED, -15)
+    return compresor.compress(datos) + compresor.flush(zlib.Z_FINISH if ultimo else zlib.Z_SYNC_FLUSH)
+
+def codificar_png(pixeles, ruta, paleta=None, nivel_compresion=NIVEL_COMPRESION_POR_DEFECTO, num_trozos=None):
+    """
+    Escribe un PNG comprimiendo franjas de filas en paralelo.
+
+    pixeles es (alto, ancho) uint8 con índices si se da paleta (lista de
+    256 colores RGB como array (n, 3)), o (alto, ancho, 3) uint8 para RGB.
+    """
+    nivel_compresion = _validar_nivel(nivel_compresion)
+    alto, ancho = pixeles.shape[:2]
+    num_trozos = max(1, min(alto, num_trozos or os.cpu_count() or 1))
+
+    # Cada fila va precedida del byte de filtro 0 (sin filtro)
+    crudo = np.zeros((alto, 1 + pixeles[0].size), dtype=np.uint8)
+    crudo[:, 1:] = pixeles.reshape(alto, -1)
+
+    limites = np.linspace(0, alto, num_trozos + 1).astype(int)
+    with ThreadPoolExecutor(max_workers=num_trozos) as executor:
+        futuros = [
+            executor.submit(_comprimir_trozo, crudo[a:b].tobytes(), nivel_compresion, b == alto)
+            for a, b in zip(limites[:-1], limites[1:]) if b > a
+        ]
+        # La suma adler32 cubre todos los datos sin comprimir
+        adler = zlib.adler32(crudo.tobytes())
+        deflate = b"".join(f.result() for f in futuros)
+
+    idat = bytes([0x78, _FLG_ZLIB[nivel_compresion]]) + deflate + struct.pack(">I", adler)
+    tipo_color = 3 if paleta is not None else 2
+    cabecera = struct.pack(">IIBBBBB", ancho, alto, 8, tipo_color, 0, 0, 0)
+
+    with open(ruta, "wb") as f:
+        f.write(FIRMA_PNG)
+        f.write(_chunk_png(b"IHDR", cabecera))
+        if paleta is not None:
+            f.write(_chunk_png(b"PLTE", np.asarray(paleta, dtype=np.uint8).tobytes()))
+        f.write(_chunk_png(b"IDAT", idat))
+        f.write(_chunk_png(b"IEND", b""))
+
+def indices_y_paleta(datos):
+    """
+    Convierte la matriz de iteraciones en índices de 8 bits y su paleta.
+
+    Si hay como mucho 256 valores distintos entre el mínimo y el máximo
+    (p. ej. max_iter=256) el resultado es exacto respecto al PNG RGB; si no,
+    se cuantiza a 255 niveles y el índice 255 queda para el interior (negro).
+    """
+    minimo, maximo = int(datos.min()), int(datos.max())
+    if maximo - minimo < 256:
+        indices = (datos - minimo).astype(np.uint8)
+        paleta = colorear(np.arange(minimo, maximo + 1, dtype=float))
+    else:
+        indices = np.where(datos >= maximo, 255, datos / maximo * 255).astype(np.uint8)
+        paleta = colorear(np.append(np.arange(255) / 255, 1.0))
+    return indices, paleta
+
+def guardar_imagen_pil(datos, ruta, nivel_compresion=NIVEL_COMPRESION_POR_DEFECTO, formato="png"):
+    """
+    Imagen RGB de 24 bits con PIL (un solo hilo), en el formato que indique
+    la extensión de ruta. nivel_compresion solo lo usan los PNG.
+    """
+    from PIL import Image
+    nivel_compresion = _validar_nivel(nivel_compresion)
+    inicio = time.perf_counter()
+    Image.fromarray(colorear(datos), mode='RGB').save(ruta, compress_level=nivel_compresion)
+    return _informe(formato, ruta, inicio)
+
+def guardar_png_paleta(datos, ruta, nivel_compresion=NIVEL_COMPRESION_POR_DEFECTO, num_trozos=None):
+    """PNG de 8 bits con paleta, codificado por trozos en paralelo."""
+    inicio = time.perf_counter()
+    indices, paleta = indices_y_paleta(datos)
+    codificar_png(indices, ruta, paleta, nivel_compresion, num_trozos)
+    return _informe("png_paleta", ruta, inicio)
+
+def guardar_png_rgb(datos, ruta, nivel_compresion=NIVEL_COMPRESION_POR_DEFECTO, num_trozos=None):
+    """PNG RGB de 24 bits, codificado por trozos en paralelo."""
+    inicio = time.perf_counter()
+    codificar_png(colorear(datos), ruta, None, nivel_compresion, num_trozos)
+    return _informe("png_rgb", ruta, inicio)
+
+def _tipo_iteraciones(datos):
+    """uint16 si las iteraciones caben (lo normal), si no se conserva el tipo."""
+    return np.uint16 if datos.max() < 2**16 else datos.dtype
+
+def guardar_npy(datos, ruta):
+    """Matriz de iteraciones cruda en formato .npy."""
+    inicio = time.perf_counter()
+    # Con un archivo abierto numpy no añade '.npy' a la ruta
+    with open(ruta, "wb") as f:
+        np.save(f, datos.astype(_tipo_iteraciones(datos)))
+    return _informe("npy", ruta, inicio)
+
+def guardar_npz(datos, ruta, **metadatos):
+    """Volcado comprimido de iteraciones; los metadatos se guardan junto a la matriz."""
+    inicio = time.perf_counter()
+    with open(ruta, "wb") as f:
+        np.savez_compressed(f, iteraciones=datos.astype(_tipo_iteraciones(datos)), **metadatos)
+    return _informe("npz", ruta, inicio)
+
+def cargar_iteraciones(ruta):
+    """
+    Lee un volcado .npy o .npz. Devuelve (iteraciones, metadatos) para
+    poder recolorear o volver a guardar en otro formato.
+    """
+    if ruta.endswith(".npz"):
+        with np.load(ruta) as archivo:
+            metadatos = {k: archivo[k].item() if archivo[k].ndim == 0 else archivo[k]
+                         for k in archivo.files if k != "iteraciones"}
+            return archivo["iteraciones"].astype(float), metadatos
+    return np.load(ruta).astype(float), {}
+
+def guardar(datos, ruta, formato=None, nivel_compresion=NIVEL_COMPRESION_POR_DEFECTO,
+            num_trozos=None, **metadatos):
+    """
+    Guarda la matriz de iteraciones en el formato pedido (o el de la extensión;
+    las extensiones desconocidas se delegan en PIL).
+    Devuelve el informe con bytes escritos y tiempo de codificación.
+    """
+    if formato is None:
+        formato = EXTENSIONES.get(os.path.splitext(ruta)[1].lower(), "pil")
+    if formato in ("png", "pil"):
+        informe = guardar_imagen_pil(datos, ruta, nivel_compresion, formato)
+    elif formato == "png_paleta":
+        informe = guardar_png_paleta(datos, ruta, nivel_compresion, num_trozos)
+    elif formato == "png_rgb":
+        informe = guardar_png_rgb(datos, ruta, nivel_compresion, num_trozos)
+    elif formato == "npy":
+        informe = guardar_npy(datos, ruta)
+    elif formato == "npz":
+        informe = guardar_npz(datos, ruta, **metadatos)
+    else:
+        raise ValueError(f"Formato desconocido: {formato}")
+    print(f"Imagen guardada como: {ruta} ({informe['bytes']:,} bytes, "
+          f"{informe['tiempo_codificacion']*1000:.1f} ms)")
+    return informe
+
+if __name__ == "__main__":
+    from mandelbrot_utils import calcular_filas_vectorizado
+
+    ANCHO, ALTO, MAX_ITER = 1920, 1080, 256
+    X_MIN, X_MAX, Y_MIN, Y_MAX = -2.5, 1.0, -1.0, 1.0
+    NIVEL = NIVEL_COMPRESION_POR_DEFECTO
+
+    print("="*70)
+    print("COMPARACIÓN DE FORMATOS DE SALIDA")
+    print("="*70)
+    datos = calcular_filas_vectorizado(0, ALTO, ANCHO, ALTO, X_MIN, X_MAX, Y_MIN, Y_MAX, MAX_ITER)
+
+    informes = [
+        guardar(datos, "mandelbrot_rgb_pil.png", "png", NIVEL),
+        guardar(datos, "mandelbrot_rgb_paralelo.png", "png_rgb", NIVEL),
+        guardar(datos, "mandelbrot_paleta.png", "png_paleta", NIVEL),
+        guardar(datos, "mandelbrot_iteraciones.npy"),
+        guardar(datos, "mandelbrot_iteraciones.npz", max_iter=MAX_ITER,
+                viewport=np.array([X_MIN, X_MAX, Y_MIN, Y_MAX])),
+    ]
+
+    base = informes[0]["bytes"]
+    print(f"\n{'Formato':<15} {'Bytes':<15} {'Tiempo (ms)':<15} {'Tamaño vs PNG RGB':<15}")
+    print("-"*70)
+    for informe in informes:
+        print(f"{informe['formato']:<15} {informe['bytes']:<15,} "
+              f"{informe['tiempo_codificacion']*1000:<15.1f} {informe['bytes'] / base:<15.2f}")
+    print("="*70)
@@ -0,0 +1,194 @@
+"""
+Motor de fórmulas vectorizadas para fractales de escape.
+
+Todas las fórmulas comparten la construcción de la malla de puntos, el
+conteo de iteraciones de escape y el coloreado (mandelbrot_utils.colorear);
+solo cambia el paso z -> f(z, c) y qué papel juega cada pixel:
+
+- Mandelbrot, Multibrot y Burning Ship: el pixel es c y z empieza en 0.
+- Julia: el pixel es z inicial y c es un parámetro fijo.
+
+Cada fórmula se registra en FORMULAS con una fábrica de pasos, así se
+pueden añadir núcleos nuevos con registrar_formula sin tocar el despacho.
+
+renderizar_julia_lote calcula muchos parámetros c en una sola pasada sobre
+un array 3D apilado (parámetro, fila, columna), lo que evita repetir el
+bucle de iteraciones (y su costo fijo por llamada a numpy) una vez por
+parámetro. Solo compensa cuando ese costo fijo domina, es decir, con
+imágenes pequeñas (miniaturas de un barrido de parámetros). A partir de
+PUNTOS_POR_TROZO pixels por imagen (p. ej. 320x240) cada imagen ya llena
+sus trozos y el lote no gana nada frente a renderizar una a una (puede
+incluso ser algo más lento); el benchmark de abajo mide ambos casos.
+
+Uso (benchmark de barrido de parámetros Julia):
+    python3 formulas.py
+"""
+
+import time
+
+import numpy as np
+
+RADIO_ESCAPE = 2
+# Tamaño de los trozos en que se procesan los puntos (cabe en caché L2)
+PUNTOS_POR_TROZO = 1 << 16
+
+def paso_mandelbrot(z, c):
+    return z*z + c
+
+def paso_burning_ship(z, c):
+    z = np.abs(z.real) + 1j * np.abs(z.imag)
+    return z*z + c
+
+def crear_paso_multibrot(exponente=2):
+    """Devuelve el paso z -> z^exponente + c."""
+    def paso(z, c):
+        return z**exponente + c
+    return paso
+
+def _paso_fijo(paso):
+    """Fábrica para fórmulas sin parámetros: siempre devuelve el mismo paso."""
+    def crear_paso(**parametros):
+        return paso
+    return crear_paso
+
+# Registro de fórmulas: nombre -> (fábrica de pasos, el pixel es 'c' o 'z0').
+# La fábrica recibe los parámetros propios de la fórmula (p. ej. exponente)
+# como argumentos con nombre, tal como llegan a calcular_puntos, y devuelve
+# el paso z -> f(z, c).
+FORMULAS = {
+    "mandelbrot": (_paso_fijo(paso_mandelbrot), "c"),
+    "multibrot": (crear_paso_multibrot, "c"),
+    "burning_ship": (_paso_fijo(paso_burning_ship), "c"),
+    "julia": (_paso_fijo(paso_mandelbrot), "z0"),
+}
+
+def registrar_formula(nombre, crear_paso, papel_pixel="c"):
+    """
+    Añade una fórmula a FORMULAS. crear_paso(**parametros) devuelve el paso,
+    donde parametros son los argumentos con nombre extra de calcular_puntos;
+    papel_pixel es 'c' (z empieza en 0) o 'z0' (c es un parámetro fijo).
+    """
+    if papel_pixel not in ("c", "z0"):
+        raise ValueError(f"Papel de pixel desconocido: {papel_pixel}")
+    FORMULAS[nombre] = (crear_paso, papel_pixel)
+
+def crear_malla(ancho, alto, x_min, x_max, y_min, y_max, fila_inicio=0, fila_fin=None):
+    """
+    Puntos complejos de las filas [fila_inicio, fila_fin) con la misma
+    correspondencia pixel -> plano complejo que los generadores.
+    """
+    if fila_fin is None:
+        fila_fin = alto
+    x = x_min + (x_max - x_min) * np.arange(ancho) / ancho
+    y = y_min + (y_max - y_min) * np.arange(fila_inicio, fila_fin) / alto
+    return x[np.newaxis, :] + 1j * y[:, np.newaxis]
+
+def iterar_escape(z0, c, paso, max_iter):
+    """
+    Cuenta las iteraciones de escape para cada punto.
+
+    z0 y c pueden tener cualquier forma compatible por broadcasting.
+    Devuelve un array float con la forma común: n si |z| > RADIO_ESCAPE en la
+    iteración n, o max_iter si el punto nunca escapa.
+
+    Los puntos se procesan en trozos de PUNTOS_POR_TROZO para que los arrays
+    de trabajo quepan en caché, y en cada paso se descartan los puntos que
+    ya escaparon.
+    """
+    z0, c = np.broadcast_arrays(np.asarray(z0, dtype=complex), np.asarray(c, dtype=complex))
+    forma = z0.shape
+    z0, c = z0.ravel(), c.ravel()
+    radio2 = RADIO_ESCAPE * RADIO_ESCAPE
+
+    resultado = np.full(z0.size, float(max_iter))
+    for inicio in range(0, z0.size, PUNTOS_POR_TROZO):
+        fin = min(z0.size, inicio + PUNTOS_POR_TROZO)
+        z, c_trozo = z0[inicio:fin].copy(), c[inicio:fin].copy()
+        indices = np.arange(inicio, fin)
+        for n in range(max_iter):
+            escaparon = z.real*z.real + z.imag*z.imag > radio2
+            if escaparon.any():
+                resultado[indices[escaparon]] = n
+                siguen = np.flatnonzero(~escaparon)
+                if siguen.size == 0:
+                    break
+                indices, z, c_trozo = indices.take(siguen), z.take(siguen), c_trozo.take(siguen)
+            z = paso(z, c_trozo)
+    return resultado.reshape(forma)
+
+def calcular_puntos(formula, puntos, max_iter, c=None, **parametros):
+    """
+    Iteraciones de escape de una fórmula de FORMULAS para puntos complejos
+    arbitrarios del plano (cualquier forma), p. ej. solo los pixels nuevos
+    de un render incremental.
+
+    c es obligatorio para las fórmulas con papel 'z0' (julia); parametros
+    se pasan a la fábrica de pasos (p. ej. exponente=3 para 'multibrot').
+    """
+    if formula not in FORMULAS:
+        raise ValueError(f"Fórmula desconocida: {formula}")
+    crear_paso, papel_pixel = FORMULAS[formula]
+    paso = crear_paso(**parametros)
+
+    if papel_pixel == "c":
+        return iterar_escape(0, puntos, paso, max_iter)
+    if c is None:
+        raise ValueError(f"La fórmula '{formula}' necesita el parámetro c")
+    return iterar_escape(puntos, c, paso, max_iter)
+
+def renderizar_formula(formula, ancho, alto, x_min, x_max, y_min, y_max, max_iter,
+                       c=None, fila_inicio=0, fila_fin=None, **parametros):
+    """
+    Genera la matriz de iteraciones para una fórmula de FORMULAS.
+
+    c es obligatorio para 'julia'; parametros se pasan a la fábrica de pasos
+    (p. ej. exponente=3 para 'multibrot').
+    """
+    malla = crear_malla(ancho, alto, x_min, x_max, y_min, y_max, fila_inicio, fila_fin)
+    return calcular_puntos(formula, malla, max_iter, c, **parametros)
+
+def renderizar_julia_lote(parametros, ancho, alto, x_min, x_max, y_min, y_max, max_iter):
+    """
+    Renderiza un conjunto de Julia por cada c de parametros en una sola pasada.
+
+    Devuelve un array (len(parametros), alto, ancho); la capa i corresponde
+    a parametros[i].
+    """
+    malla = crear_malla(ancho, alto, x_min, x_max, y_min, y_max)
+    cs = np.asarray(parametros, dtype=complex).reshape(-1, 1, 1)
+    return iterar_escape(malla[np.newaxis, :, :], cs, paso_mandelbrot, max_iter)
+
+if __name__ == "__main__":
+    # Barrido de parámetros: c recorre un círculo de radio 0.7885.
+    # Casos (num_parametros, ancho, alto): miniaturas, donde el lote compensa,
+    # e imágenes de 320x240 (>= PUNTOS_POR_TROZO pixels), donde ya no.
+    CASOS = [(256, 48, 36), (16, 320, 240)]
+    MAX_ITER = 256
+    X_MIN, X_MAX = -1.6, 1.6
+    Y_MIN, Y_MAX = -1.2, 1.2
+
+    print("="*70)
+    print("BARRIDO DE PARÁMETROS JULIA - UNO A UNO vs LOTE")
+    print("="*70)
+    print(f"max_iter={MAX_ITER}\n")
+    print(f"{'Caso':<20} {'Uno a uno (s)':<15} {'Lote 3D (s)':<15} {'Speedup':<10} {'Idénticos':<10}")
+    print("-"*70)
+
+    for num_parametros, ancho, alto in CASOS:
+        parametros = 0.7885 * np.exp(1j * np.linspace(0, 2*np.pi, num_parametros, endpoint=False))
+
+        inicio = time.perf_counter()
+        uno_a_uno = np.stack([
+            renderizar_formula("julia", ancho, alto, X_MIN, X_MAX, Y_MIN, Y_MAX, MAX_ITER, c=c)
+            for c in parametros
+        ])
+        tiempo_uno_a_uno = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        lote = renderizar_julia_lote(parametros, ancho, alto, X_MIN, X_MAX, Y_MIN, Y_MAX, MAX_ITER)
+        tiempo_lote = time.perf_counter() - inicio
+
+        caso = f"{num_parametros} x {ancho}x{alto}"
+        print(f"{caso:<20} {tiempo_uno_a_uno:<15.3f} {tiempo_lote:<15.3f} "
+              f"{f'{tiempo_uno_a_uno / tiempo_lote:.2f}x':<10} {str(np.array_equal(uno_a_uno, lote)):<10}")
+    print("="*70)
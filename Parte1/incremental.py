@@ -0,0 +1,135 @@
+"""
+Re-render incremental al desplazar (pan) o acercar (zoom) el viewport.
+
+Cuando el viewport se mueve unos pocos pixels, casi todo el cuadro nuevo es
+el cuadro anterior trasladado. renderizar_incremental copia los pixels cuyo
+punto del plano coincide exactamente con un pixel del cuadro anterior y solo
+calcula los que quedan al descubierto (las franjas nuevas).
+
+La coincidencia es exacta por eje: en un pan alineado a pixels se reutiliza
+toda la zona solapada, y en un zoom de factor entero (2x, 3x...) se
+reutiliza la rejilla alineada (uno de cada k pixels al acercar, todos los
+del área común al alejar). Para que un pan o zoom arbitrario quede alineado
+a la rejilla anterior se puede usar alinear_viewport.
+
+Un viewport es una tupla (x_min, x_max, y_min, y_max), igual que en los
+generadores. El cuadro anterior debe haberse calculado con el mismo max_iter
+y la misma fórmula.
+
+Uso (demostración de una secuencia de pans y zooms):
+    python3 incremental.py
+"""
+
+import time
+
+import numpy as np
+
+from formulas import calcular_puntos, crear_malla, renderizar_formula
+
+# Diferencia máxima (en fracciones de pixel) para considerar que dos pixels coinciden
+TOLERANCIA_PIXEL = 1e-6
+
+def _correspondencia_eje(n_nuevo, min_nuevo, max_nuevo, n_previo, min_previo, max_previo):
+    """
+    Para cada pixel nuevo de un eje devuelve el índice del pixel anterior que
+    cae exactamente en la misma coordenada, o -1 si no hay ninguno.
+    """
+    coordenadas = min_nuevo + (max_nuevo - min_nuevo) * np.arange(n_nuevo) / n_nuevo
+    posicion = (coordenadas - min_previo) / ((max_previo - min_previo) / n_previo)
+    indice = np.rint(posicion)
+    valido = (np.abs(posicion - indice) <= TOLERANCIA_PIXEL) & (indice >= 0) & (indice < n_previo)
+    return np.where(valido, indice, -1).astype(int)
+
+def alinear_viewport(viewport_previo, viewport_nuevo, ancho, alto):
+    """
+    Ajusta la esquina mínima del viewport nuevo al pixel más cercano de la
+    rejilla anterior (de tamaño ancho x alto), conservando su ancho y alto
+    en el plano. Así un pan deja de tener desplazamientos fraccionarios.
+    """
+    x_min_p, x_max_p, y_min_p, y_max_p = viewport_previo
+    x_min, x_max, y_min, y_max = viewport_nuevo
+    paso_x = (x_max_p - x_min_p) / ancho
+    paso_y = (y_max_p - y_min_p) / alto
+    x_alineado = x_min_p + round((x_min - x_min_p) / paso_x) * paso_x
+    y_alineado = y_min_p + round((y_min - y_min_p) / paso_y) * paso_y
+    return (x_alineado, x_alineado + (x_max - x_min), y_alineado, y_alineado + (y_max - y_min))
+
+def renderizar_incremental(previo, viewport_previo, viewport_nuevo, max_iter,
+                           ancho=None, alto=None, formula="mandelbrot", c=None,
+                           **parametros):
+    """
+    Genera el cuadro de viewport_nuevo reutilizando los pixels de previo.
+
+    ancho y alto del cuadro nuevo son por defecto los de previo. Devuelve
+    (imagen, fraccion_reutilizada), donde fraccion_reutilizada es la
+    proporción de pixels copiados del cuadro anterior (0.0 a 1.0).
+    formula, c y parametros se pasan a formulas.calcular_puntos.
+    """
+    alto_previo, ancho_previo = previo.shape
+    ancho = ancho or ancho_previo
+    alto = alto or alto_previo
+    x_min, x_max, y_min, y_max = viewport_nuevo
+    x_min_p, x_max_p, y_min_p, y_max_p = viewport_previo
+
+    columnas = _correspondencia_eje(ancho, x_min, x_max, ancho_previo, x_min_p, x_max_p)
+    filas = _correspondencia_eje(alto, y_min, y_max, alto_previo, y_min_p, y_max_p)
+    cols_ok = columnas >= 0
+    filas_ok = filas >= 0
+
+    imagen = np.empty((alto, ancho))
+    # Zona común: copia directa desde el cuadro anterior
+    imagen[np.ix_(filas_ok, cols_ok)] = previo[np.ix_(filas[filas_ok], columnas[cols_ok])]
+
+    # Pixels al descubierto: solo esos puntos se calculan
+    nuevos = ~(filas_ok[:, np.newaxis] & cols_ok[np.newaxis, :])
+    if nuevos.any():
+        puntos = crear_malla(ancho, alto, x_min, x_max, y_min, y_max)[nuevos]
+        imagen[nuevos] = calcular_puntos(formula, puntos, max_iter, c, **parametros)
+
+    fraccion_reutilizada = 1.0 - nuevos.sum() / nuevos.size
+    return imagen, fraccion_reutilizada
+
+if __name__ == "__main__":
+    ANCHO, ALTO, MAX_ITER = 1920, 1080, 256
+    viewport = (-2.5, 1.0, -1.0, 1.0)
+
+    def desplazar(vp, fx, fy):
+        dx, dy = (vp[1] - vp[0]) * fx, (vp[3] - vp[2]) * fy
+        return (vp[0] + dx, vp[1] + dx, vp[2] + dy, vp[3] + dy)
+
+    def acercar(vp, factor):
+        cx, cy = (vp[0] + vp[1]) / 2, (vp[2] + vp[3]) / 2
+        rx, ry = (vp[1] - vp[0]) / (2 * factor), (vp[3] - vp[2]) / (2 * factor)
+        return (cx - rx, cx + rx, cy - ry, cy + ry)
+
+    movimientos = [
+        ("Pan 3% derecha", lambda vp: desplazar(vp, 0.03, 0)),
+        ("Pan 5% abajo", lambda vp: desplazar(vp, 0, 0.05)),
+        ("Pan 2% diagonal", lambda vp: desplazar(vp, -0.02, -0.02)),
+        ("Zoom 2x", lambda vp: acercar(vp, 2)),
+        ("Zoom 0.5x", lambda vp: acercar(vp, 0.5)),
+    ]
+
+    print("="*70)
+    print("RE-RENDER INCREMENTAL - PAN Y ZOOM")
+    print("="*70)
+    cuadro = renderizar_formula("mandelbrot", ANCHO, ALTO, *viewport, MAX_ITER)
+
+    print(f"{'Movimiento':<20} {'Completo (s)':<14} {'Incremental (s)':<17} {'Reutilizado':<13} {'Iguales':<8}")
+    print("-"*70)
+    for nombre, mover in movimientos:
+        nuevo = alinear_viewport(viewport, mover(viewport), ANCHO, ALTO)
+
+        inicio = time.perf_counter()
+        completo = renderizar_formula("mandelbrot", ANCHO, ALTO, *nuevo, MAX_ITER)
+        tiempo_completo = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        cuadro, reutilizado = renderizar_incremental(cuadro, viewport, nuevo, MAX_ITER)
+        tiempo_incremental = time.perf_counter() - inicio
+
+        iguales = np.mean(cuadro == completo) * 100
+        print(f"{nombre:<20} {tiempo_completo:<14.3f} {tiempo_incremental:<17.3f} "
+              f"{f'{reutilizado*100:.1f}%':<13} {f'{iguales:.2f}%':<8}")
+        viewport = nuevo
+    print("="*70)
@@ -4,58 +4,86 @@ Genera una imagen del fractal de Mandelbrot usando múltiples hilos en paralelo.
 """
 
 import numpy as np
+import queue
+import sys
 import time
 import threading
+import traza
 from mandelbrot_utils import calcular_mandelbrot, guardar_imagen_color
 
-def procesar_filas(imagen, filas_inicio, filas_fin, ancho, alto, x_min, x_max, y_min, y_max, max_iter, thread_id):
+def procesar_filas(imagen, filas_inicio, filas_fin, ancho, alto, x_min, x_max, y_min, y_max, max_iter, thread_id,
+                   verbose=True):
     """
-    Procesa un rango de filas de la imagen (trabajo de un hilo).
+    Procesa un rango de filas de la imagen (un bloque de trabajo de un hilo).
     """
-    print(f"  Hilo {thread_id}: procesando filas {filas_inicio} a {filas_fin-1}")
+    if verbose:
+        print(f"  Hilo {thread_id}: procesando filas {filas_inicio} a {filas_fin-1}")
     
-    for fila in range(filas_inicio, filas_fin):
-        for columna in range(ancho):
-            x = x_min + (x_max - x_min) * columna / ancho
-            y = y_min + (y_max - y_min) * fila / alto
-            c = complex(x, y)
-            imagen[fila, columna] = calcular_mandelbrot(c, max_iter)
+    with traza.tramo(f"Filas {filas_inicio}-{filas_fin-1}", "tile", hilo=thread_id):
+        for fila in range(filas_inicio, filas_fin):
+            for columna in range(ancho):
+                x = x_min + (x_max - x_min) * columna / ancho
+                y = y_min + (y_max - y_min) * fila / alto
+                c = complex(x, y)
+                imagen[fila, columna] = calcular_mandelbrot(c, max_iter)
+
+def trabajador(cola, imagen, ancho, alto, x_min, x_max, y_min, y_max, max_iter, thread_id, verbose=True):
+    """
+    Trabajo de un hilo: toma bloques de filas de la cola hasta vaciarla.
+    """
+    while True:
+        try:
+            fila_inicio, fila_fin = cola.get_nowait()
+        except queue.Empty:
+            break
+        procesar_filas(imagen, fila_inicio, fila_fin, ancho, alto, x_min, x_max, y_min, y_max,
+                       max_iter, thread_id, verbose)
     
-    print(f"  Hilo {thread_id}: completado")
+    if verbose:
+        print(f"  Hilo {thread_id}: completado")
 
-def generar_mandelbrot_multihilo(ancho, alto, x_min, x_max, y_min, y_max, max_iter, num_hilos):
+def generar_mandelbrot_multihilo(ancho, alto, x_min, x_max, y_min, y_max, max_iter, num_hilos,
+                                 filas_por_bloque=None, verbose=True):
     """
     Genera la imagen completa del conjunto de Mandelbrot usando múltiples hilos.
+    
+    La imagen se divide en bloques de filas_por_bloque filas que los hilos
+    toman de una cola compartida. Por defecto hay un bloque por hilo.
     """
     imagen = np.zeros((alto, ancho))
+    if filas_por_bloque is None:
+        filas_por_bloque = -(-alto // num_hilos)  # división hacia arriba
     
-    print(f"Generando imagen de {ancho}x{alto} pixels usando {num_hilos} hilos...")
-    print(f"Calculando {ancho * alto:,} puntos en paralelo...")
+    cola = queue.Queue()
+    for fila_inicio in range(0, alto, filas_por_bloque):
+        cola.put((fila_inicio, min(alto, fila_inicio + filas_por_bloque)))
     
-    filas_por_hilo = alto // num_hilos
-    hilos = []
-    
-    print(f"\nDistribución de trabajo:")
-    print(f"  Total de filas: {alto}")
-    print(f"  Filas por hilo: ~{filas_por_hilo}")
-    print(f"\nIniciando hilos...")
+    if verbose:
+        print(f"Generando imagen de {ancho}x{alto} pixels usando {num_hilos} hilos...")
+        print(f"Calculando {ancho * alto:,} puntos en paralelo...")
+        print(f"\nDistribución de trabajo:")
+        print(f"  Total de filas: {alto}")
+        print(f"  Filas por bloque: {filas_por_bloque} ({cola.qsize()} bloques)")
+        print(f"\nIniciando hilos...")
     
+    hilos = []
     for i in range(num_hilos):
-        fila_inicio = i * filas_por_hilo
-        fila_fin = alto if i == num_hilos - 1 else (i + 1) * filas_por_hilo
-        
         hilo = threading.Thread(
-            target=procesar_filas,
-            args=(imagen, fila_inicio, fila_fin, ancho, alto, x_min, x_max, y_min, y_max, max_iter, i+1)
+            target=trabajador,
+            args=(cola, imagen, ancho, alto, x_min, x_max, y_min, y_max, max_iter, i+1, verbose),
+            name=f"Hilo {i+1}"
         )
         hilos.append(hilo)
         hilo.start()
     
-    print(f"\nEsperando a que todos los hilos terminen...")
-    for hilo in hilos:
-        hilo.join()
+    if verbose:
+        print(f"\nEsperando a que todos los hilos terminen...")
+    with traza.tramo("Esperar hilos", "sincronizacion"):
+        for hilo in hilos:
+            hilo.join()
     
-    print(f"Todos los hilos completados\n")
+    if verbose:
+        print(f"Todos los hilos completados\n")
     return imagen
 
 if __name__ == "__main__":
@@ -63,7 +91,16 @@ if __name__ == "__main__":
     ANCHO = 1920
     ALTO = 1080
     MAX_ITER = 256
-    NUM_HILOS = 8  # CAMBIA ESTO: 2, 4, 8, 16, etc.
+    # Número de hilos: se pasa como argumento o lo elige el autotuner de esta máquina
+    # (junto con el tamaño de bloque con el que se calibró)
+    if len(sys.argv) > 1:
+        NUM_HILOS = int(sys.argv[1])
+        FILAS_POR_BLOQUE = None
+    else:
+        from autotuner import obtener_configuracion
+        config = obtener_configuracion(ANCHO, ALTO, MAX_ITER, backends=("hilos",))
+        NUM_HILOS = config["num_trabajadores"]
+        FILAS_POR_BLOQUE = config["filas_por_bloque"]
     
     X_MIN, X_MAX = -2.5, 1.0
     Y_MIN, Y_MAX = -1.0, 1.0
@@ -73,7 +110,8 @@ if __name__ == "__main__":
     print("="*60)
     
     inicio = time.time()
-    resultado = generar_mandelbrot_multihilo(ANCHO, ALTO, X_MIN, X_MAX, Y_MIN, Y_MAX, MAX_ITER, NUM_HILOS)
+    resultado = generar_mandelbrot_multihilo(ANCHO, ALTO, X_MIN, X_MAX, Y_MIN, Y_MAX, MAX_ITER, NUM_HILOS,
+                                             FILAS_POR_BLOQUE)
     fin = time.time()
     tiempo_total = fin - inicio
     
@@ -87,3 +125,6 @@ if __name__ == "__main__":
     print(f"Pixels por segundo: {(ANCHO * ALTO) / tiempo_total:,.0f}")
     print("="*60)
     print(f"\nPara calcular speedup: divide el tiempo secuencial entre {tiempo_total:.2f}")
+    
+    # Solo si se ejecutó con MANDELBROT_TRAZA=archivo.json
+    traza.exportar_si_activa("traza_multihilo.json")
@@ -1,9 +1,13 @@
 """
 Funciones compartidas para generar imágenes con colores del fractal de Mandelbrot.
+
+El núcleo de cálculo no importa PIL: solo se carga cuando se guarda una imagen,
+así los procesos trabajadores que únicamente calculan arrancan más rápido.
 """
 
 import numpy as np
-from PIL import Image
+
+from formulas import renderizar_formula
 
 def calcular_mandelbrot(c, max_iter):
     """
@@ -16,44 +20,59 @@ def calcular_mandelbrot(c, max_iter):
         z = z*z + c
     return max_iter
 
-def guardar_imagen_color(datos, nombre_archivo):
+def calcular_filas(fila_inicio, fila_fin, ancho, alto, x_min, x_max, y_min, y_max, max_iter):
     """
-    Guarda los datos del Mandelbrot como imagen PNG con colores vibrantes.
+    Calcula un bloque de filas [fila_inicio, fila_fin) de la imagen completa.
     
-    Aplica un mapa de colores personalizado que hace el fractal mucho más visual.
+    Devuelve un array de forma (fila_fin - fila_inicio, ancho) con las iteraciones
+    de escape; es la unidad de trabajo que se reparte entre hilos o procesos.
+    """
+    bloque = np.zeros((fila_fin - fila_inicio, ancho))
+    for fila in range(fila_inicio, fila_fin):
+        y = y_min + (y_max - y_min) * fila / alto
+        for columna in range(ancho):
+            x = x_min + (x_max - x_min) * columna / ancho
+            bloque[fila - fila_inicio, columna] = calcular_mandelbrot(complex(x, y), max_iter)
+    return bloque
+
+def calcular_filas_vectorizado(fila_inicio, fila_fin, ancho, alto, x_min, x_max, y_min, y_max, max_iter):
+    """
+    Versión vectorizada con numpy de calcular_filas (mismo resultado, misma forma).
+    Usa el motor de fórmulas con la fórmula clásica z = z² + c.
+    """
+    return renderizar_formula("mandelbrot", ancho, alto, x_min, x_max, y_min, y_max, max_iter,
+                              fila_inicio=fila_inicio, fila_fin=fila_fin)
+
+def colorear(datos):
+    """
+    Convierte la matriz de iteraciones en una imagen RGB (uint8) con el mapa
+    de colores clásico azul-morado-naranja. Los puntos que nunca escapan
+    (valor máximo) quedan en negro.
     """
     # Normalizar datos
     datos_norm = datos / datos.max()
+    t = datos_norm % 1.0  # Usar módulo para crear patrón repetitivo
     
-    # Crear imagen RGB
-    alto, ancho = datos.shape
-    imagen_rgb = np.zeros((alto, ancho, 3), dtype=np.uint8)
+    # Fórmula de colores que crea ese efecto azul-morado-naranja típico
+    imagen_rgb = np.empty(datos.shape + (3,), dtype=np.uint8)
+    imagen_rgb[..., 0] = np.clip(9 * (1 - t) * t**3 * 255, 0, 255)
+    imagen_rgb[..., 1] = np.clip(15 * (1 - t)**2 * t**2 * 255, 0, 255)
+    imagen_rgb[..., 2] = np.clip(8.5 * (1 - t)**3 * t * 255, 0, 255)
     
-    # Aplicar mapa de colores personalizado (estilo clásico de Mandelbrot)
-    for i in range(alto):
-        for j in range(ancho):
-            valor = datos_norm[i, j]
-            
-            if valor == 1.0:  # Puntos que nunca escapan (dentro del conjunto)
-                # Negro
-                imagen_rgb[i, j] = [0, 0, 0]
-            else:
-                # Crear gradiente de colores basado en velocidad de escape
-                t = valor % 1.0  # Usar módulo para crear patrón repetitivo
-                
-                # Fórmula de colores que crea ese efecto azul-morado-naranja típico
-                r = int(9 * (1 - t) * t**3 * 255)
-                g = int(15 * (1 - t)**2 * t**2 * 255)
-                b = int(8.5 * (1 - t)**3 * t * 255)
-                
-                # Asegurar que los valores estén en rango 0-255
-                r = max(0, min(255, r))
-                g = max(0, min(255, g))
-                b = max(0, min(255, b))
-                
-                imagen_rgb[i, j] = [r, g, b]
+    # Puntos que nunca escapan (dentro del conjunto): negro
+    imagen_rgb[datos_norm == 1.0] = 0
+    return imagen_rgb
+
+def guardar_imagen_color(datos, nombre_archivo, formato=None, nivel_compresion=6):
+    """
+    Guarda los datos del Mandelbrot como imagen PNG con colores vibrantes.
     
-    # Guardar
-    img = Image.fromarray(imagen_rgb, mode='RGB')
-    img.save(nombre_archivo)
-    print(f"Imagen guardada como: {nombre_archivo}")
+    Aplica un mapa de colores personalizado que hace el fractal mucho más visual.
+    formato puede ser 'png', 'png_paleta', 'png_rgb', 'npy', 'npz' o 'pil'
+    (ver formatos.py); por defecto se deduce de la extensión y cualquier
+    extensión que soporte PIL (.jpg, .bmp...) sigue funcionando. Devuelve un informe
+    con los bytes escritos y el tiempo de codificación.
+    """
+    # Se importa aquí para no cargar PIL ni la capa de formatos en los trabajadores
+    from formatos import guardar
+    return guardar(datos, nombre_archivo, formato, nivel_compresion)
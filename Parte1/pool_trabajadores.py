@@ -0,0 +1,137 @@
+"""
+Pool persistente de procesos trabajadores para el fractal de Mandelbrot.
+
+Los procesos se crean una sola vez desde un forkserver que ya tiene cargado
+mandelbrot_utils (y con él numpy). Cada render posterior reutiliza esos
+procesos "calientes", así que no paga el arranque del intérprete ni las
+importaciones, que en renders pequeños dominan el tiempo total.
+"""
+
+import atexit
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import traza
+from mandelbrot_utils import calcular_filas
+
+# Módulos que el forkserver importa una vez y heredan todos los trabajadores
+MODULOS_PRECARGADOS = ["mandelbrot_utils", "formulas", "traza"]
+
+_pool_global = None
+
+def _crear_contexto():
+    """
+    Devuelve el contexto de multiprocessing a usar.
+    Prefiere forkserver (Linux) con precarga; si no existe, usa spawn.
+    """
+    if "forkserver" in mp.get_all_start_methods():
+        ctx = mp.get_context("forkserver")
+        ctx.set_forkserver_preload(MODULOS_PRECARGADOS)
+        return ctx
+    return mp.get_context("spawn")
+
+def _ping(_):
+    """Tarea vacía usada para forzar el arranque de los trabajadores."""
+    return os.getpid()
+
+def _procesar_bloque(fila_inicio, fila_fin, ancho, alto, x_min, x_max, y_min, y_max, max_iter, trazar=False):
+    """
+    Trabajo de un proceso: calcula un bloque de filas.
+    Si trazar es True devuelve también los eventos de traza del trabajador.
+
+    El trabajador es persistente, así que el estado de la traza se fija en
+    cada llamada: un render sin traza no deja eventos en los buffers y uno
+    con traza empieza con los buffers vacíos.
+    """
+    if trazar:
+        traza.activar()
+        traza.descartar()
+        traza.configurar_proceso(f"Trabajador {os.getpid()}")
+    else:
+        traza.desactivar()
+    with traza.tramo(f"Filas {fila_inicio}-{fila_fin-1}", "tile"):
+        bloque = calcular_filas(fila_inicio, fila_fin, ancho, alto, x_min, x_max, y_min, y_max, max_iter)
+    return fila_inicio, bloque, traza.recolectar() if trazar else []
+
+class PoolMandelbrot:
+    """
+    Pool de procesos de larga duración reutilizable entre muchos renders.
+
+    Se puede usar como gestor de contexto (with) o cerrarlo con cerrar().
+    """
+
+    def __init__(self, num_procesos=None):
+        self.num_procesos = num_procesos or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.num_procesos,
+            mp_context=_crear_contexto()
+        )
+
+    def calentar(self):
+        """Arranca todos los procesos ahora, antes del primer render."""
+        pids = set(self._executor.map(_ping, range(self.num_procesos * 2)))
+        return len(pids)
+
+    def renderizar(self, ancho, alto, x_min, x_max, y_min, y_max, max_iter, filas_por_bloque=None):
+        """
+        Genera la imagen completa repartiendo bloques de filas entre los procesos.
+
+        Por defecto usa 4 bloques por proceso para equilibrar la carga
+        (las filas del centro del fractal son más costosas).
+        """
+        if filas_por_bloque is None:
+            filas_por_bloque = max(1, alto // (self.num_procesos * 4))
+
+        trazar = traza.esta_activa()
+        futuros = []
+        for fila_inicio in range(0, alto, filas_por_bloque):
+            fila_fin = min(alto, fila_inicio + filas_por_bloque)
+            futuros.append(self._executor.submit(
+                _procesar_bloque, fila_inicio, fila_fin, ancho, alto,
+                x_min, x_max, y_min, y_max, max_iter, trazar
+            ))
+
+        imagen = np.zeros((alto, ancho))
+        with traza.tramo("Esperar bloques", "sincronizacion"):
+            for futuro in futuros:
+                fila_inicio, bloque, eventos = futuro.result()
+                imagen[fila_inicio:fila_inicio + bloque.shape[0]] = bloque
+                traza.incorporar(eventos)
+        return imagen
+
+    def cerrar(self):
+        """Termina los procesos del pool."""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+def obtener_pool(num_procesos=None):
+    """
+    Devuelve el pool compartido del proceso, creándolo y calentándolo la primera vez.
+
+    Llamadas posteriores reutilizan los mismos trabajadores; si se pide un
+    número de procesos distinto, se reemplaza el pool.
+    """
+    global _pool_global
+    if _pool_global is not None and num_procesos not in (None, _pool_global.num_procesos):
+        _pool_global.cerrar()
+        _pool_global = None
+    if _pool_global is None:
+        _pool_global = PoolMandelbrot(num_procesos)
+        _pool_global.calentar()
+    return _pool_global
+
+def _cerrar_pool_global():
+    global _pool_global
+    if _pool_global is not None:
+        _pool_global.cerrar()
+        _pool_global = None
+
+atexit.register(_cerrar_pool_global)
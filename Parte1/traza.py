@@ -0,0 +1,169 @@
+"""
+Trazas de línea de tiempo (opcionales) en formato Chrome trace-event.
+
+Se activa con la variable de entorno MANDELBROT_TRAZA=archivo.json o llamando
+a activar(). Cada hilo escribe sus eventos en su propio buffer circular
+(deque con maxlen), así el bucle de cálculo nunca toma locks; el único lock
+se usa al registrar el buffer de un hilo nuevo.
+
+Los eventos de procesos trabajadores y de ranks MPI se recolectan con
+recolectar(), se envían al proceso principal y se agregan con incorporar().
+El JSON resultante se abre en chrome://tracing o en Perfetto
+(ui.perfetto.dev) para ver huecos ociosos, rezagados y esperas de comunicación.
+"""
+
+import collections
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+CAPACIDAD_POR_DEFECTO = 100_000
+
+_activa = bool(os.environ.get("MANDELBROT_TRAZA"))
+_capacidad = CAPACIDAD_POR_DEFECTO
+_local = threading.local()
+_buffers = []          # (pid, tid, hilo, deque) de este proceso
+_lock_registro = threading.Lock()
+_externos = []         # eventos ya convertidos que llegan de otros procesos
+_metadatos_vistos = set()  # (nombre, pid, tid) de los eventos "M" ya incorporados
+_proceso = {"pid": None, "nombre": None}
+
+def activar(capacidad=CAPACIDAD_POR_DEFECTO):
+    """Activa la traza; capacidad es el número máximo de eventos por hilo."""
+    global _activa, _capacidad
+    _activa = True
+    _capacidad = capacidad
+
+def desactivar():
+    global _activa
+    _activa = False
+
+def esta_activa():
+    return _activa
+
+@contextmanager
+def pausada():
+    """Desactiva la traza dentro del bloque with y restaura el estado anterior."""
+    global _activa
+    anterior = _activa
+    _activa = False
+    try:
+        yield
+    finally:
+        _activa = anterior
+
+def configurar_proceso(nombre, pid=None):
+    """
+    Pone nombre al proceso en la línea de tiempo.
+    Con MPI conviene usar pid=rank para que no choquen PIDs de distintos hosts.
+    """
+    _proceso["nombre"] = nombre
+    _proceso["pid"] = pid
+
+def _ahora_us():
+    # Reloj de pared en microsegundos: común a procesos y (con NTP) a hosts
+    return time.time_ns() / 1000
+
+def _buffer():
+    """Buffer circular del hilo actual (se crea la primera vez)."""
+    buffer = getattr(_local, "buffer", None)
+    if buffer is None or _local.pid != os.getpid():
+        buffer = collections.deque(maxlen=_capacidad)
+        _local.buffer = buffer
+        _local.pid = os.getpid()
+        with _lock_registro:
+            _buffers.append((os.getpid(), threading.get_native_id(),
+                             threading.current_thread(), buffer))
+    return buffer
+
+@contextmanager
+def tramo(nombre, categoria="calculo", **args):
+    """
+    Registra un evento con inicio y fin alrededor del bloque with.
+    Si la traza no está activa no hace nada.
+    """
+    if not _activa:
+        yield
+        return
+    inicio = _ahora_us()
+    try:
+        yield
+    finally:
+        _buffer().append((nombre, categoria, inicio, _ahora_us() - inicio, args))
+
+def _buffers_propios():
+    """
+    Buffers de este proceso. Los de hilos ya terminados se quitan del
+    registro (sus eventos pendientes se devuelven una última vez), así sus
+    nombres no se repiten en trazas posteriores ni etiquetan a un hilo nuevo
+    que reutilice el mismo tid.
+    """
+    pid_propio = os.getpid()
+    with _lock_registro:
+        propios = [b for b in _buffers if b[0] == pid_propio]
+        _buffers[:] = [b for b in _buffers if b[0] != pid_propio or b[2].is_alive()]
+    return propios
+
+def recolectar():
+    """
+    Convierte y vacía los buffers de este proceso.
+    Devuelve una lista de eventos trace-event lista para serializar.
+    """
+    pid_propio = os.getpid()
+    pid = _proceso["pid"] if _proceso["pid"] is not None else pid_propio
+    eventos = []
+    if _proceso["nombre"]:
+        eventos.append({"name": "process_name", "ph": "M", "pid": pid,
+                        "args": {"name": _proceso["nombre"]}})
+    for _, tid, hilo, buffer in _buffers_propios():
+        if not buffer and not hilo.is_alive():
+            continue
+        eventos.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                        "args": {"name": hilo.name}})
+        while buffer:
+            nombre, categoria, inicio, duracion, args = buffer.popleft()
+            eventos.append({"name": nombre, "cat": categoria, "ph": "X",
+                            "ts": inicio, "dur": duracion,
+                            "pid": pid, "tid": tid, "args": args})
+    return eventos
+
+def descartar():
+    """Vacía los buffers de este proceso sin convertir los eventos."""
+    for _, _, _, buffer in _buffers_propios():
+        buffer.clear()
+
+def _metadato_repetido(evento):
+    """True si es un evento "M" (nombre de proceso/hilo) ya emitido en esta traza."""
+    if evento["ph"] != "M":
+        return False
+    clave = (evento["name"], evento["pid"], evento.get("tid"))
+    if clave in _metadatos_vistos:
+        return True
+    _metadatos_vistos.add(clave)
+    return False
+
+def incorporar(eventos):
+    """
+    Agrega eventos recolectados en otro proceso (trabajador o rank MPI).
+    Los metadatos de nombre de proceso/hilo repetidos se descartan.
+    """
+    for evento in eventos:
+        if not _metadato_repetido(evento):
+            _externos.append(evento)
+
+def exportar(ruta):
+    """Escribe en ruta todos los eventos (propios y externos) como JSON."""
+    # Los metadatos propios pueden haber llegado ya por incorporar (rank 0 de MPI)
+    eventos = [e for e in recolectar() if not _metadato_repetido(e)] + _externos
+    _externos.clear()
+    _metadatos_vistos.clear()
+    with open(ruta, "w") as f:
+        json.dump({"traceEvents": eventos, "displayTimeUnit": "ms"}, f)
+    print(f"Traza guardada como: {ruta} ({len(eventos)} eventos)")
+
+def exportar_si_activa(ruta_por_defecto="traza.json"):
+    """Exporta a MANDELBROT_TRAZA (o ruta_por_defecto) solo si la traza está activa."""
+    if _activa:
+        exportar(os.environ.get("MANDELBROT_TRAZA") or ruta_por_defecto)
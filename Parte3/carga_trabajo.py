@@ -0,0 +1,118 @@
+"""
+Carga de trabajo común para el clúster MPI y la línea base single-node.
+
+El script MPI (mandelbrot_cluster_mpi.py, o su alias cluster_mpi.py) y la
+línea base de un solo nodo (comparar_cluster.py) usan el mismo kernel, el
+mismo particionado, la misma ventana de medición (Barrier inicial -> cálculo ->
+gather -> Barrier final en MPI; pool caliente -> cálculo -> resultados en
+single-node) y el mismo esquema de métricas, así que el speedup y la
+eficiencia entre ambas arquitecturas comparan exactamente el mismo trabajo.
+"""
+
+import json
+import time
+
+# Carga de trabajo total
+N_TOTAL = 100_000_000  # 100 millones de operaciones
+
+def particionar(n_total, num_partes, parte):
+    """
+    Rango [inicio, fin) que le toca a una parte (rank o proceso).
+    El resto de la división se reparte entre las primeras partes,
+    así se procesan las n_total operaciones completas.
+    """
+    base, resto = divmod(n_total, num_partes)
+    inicio = parte * base + min(parte, resto)
+    fin = inicio + base + (1 if parte < resto else 0)
+    return inicio, fin
+
+def calcular_subtarea(inicio_rango, fin_rango):
+    """
+    Kernel de trabajo: procesa el rango [inicio_rango, fin_rango).
+    Devuelve (tiempo_local, conteo).
+    """
+    inicio = time.perf_counter()
+
+    # Simulación de procesamiento intensivo
+    conteo = 0
+    for i in range(inicio_rango, fin_rango):
+        conteo += (i % 1000)  # Operación simple para simular carga
+
+    tiempo_local = time.perf_counter() - inicio
+    return tiempo_local, conteo
+
+def calcular_metricas(arquitectura, n_total, tiempo_total, tiempos, resultados):
+    """
+    Construye el diccionario de métricas común a ambas arquitecturas.
+    tiempos y resultados son las listas por nodo (rank o proceso).
+    """
+    nodos = len(tiempos)
+    tiempo_max = max(tiempos)
+    tiempo_min = min(tiempos)
+    tiempo_promedio = sum(tiempos) / nodos
+    return {
+        "arquitectura": arquitectura,
+        "nodos": nodos,
+        "n_total": n_total,
+        "tiempo_total": tiempo_total,
+        "tiempos_por_nodo": list(tiempos),
+        "carga_por_nodo": [fin - inicio for inicio, fin in
+                           (particionar(n_total, nodos, i) for i in range(nodos))],
+        "resultado_total": sum(resultados),
+        "tiempo_max": tiempo_max,
+        "tiempo_min": tiempo_min,
+        "tiempo_promedio": tiempo_promedio,
+        "desbalance": ((tiempo_max - tiempo_min) / tiempo_promedio) * 100,
+        "throughput": n_total / tiempo_total,
+        # Ocupación: fracción del tiempo total que los nodos pasan calculando.
+        # La eficiencia (speedup / nodos) necesita una referencia de 1 nodo
+        # y se calcula al comparar ejecuciones (comparar_cluster.py).
+        "ocupacion": tiempo_promedio / tiempo_total * 100,
+    }
+
+def imprimir_metricas(metricas):
+    """Muestra la tabla por nodo y las métricas de rendimiento."""
+    print("="*70)
+    print(f"RESULTADOS POR NODO - {metricas['arquitectura'].upper()} ({metricas['nodos']} nodos)")
+    print("="*70)
+    print(f"{'Nodo':<8} {'Tiempo (s)':<15} {'Operaciones':<15} {'Ops/seg':<15}")
+    print("-"*70)
+
+    for i, (t, ops) in enumerate(zip(metricas["tiempos_por_nodo"], metricas["carga_por_nodo"])):
+        ops_por_seg = ops / t if t > 0 else 0
+        print(f"{i:<8} {t:<15.4f} {ops:<15,} {ops_por_seg:<15,.0f}")
+
+    print("-"*70)
+    print(f"\nTiempo total de ejecución: {metricas['tiempo_total']:.4f} s")
+    print(f"Tiempo del nodo más rápido: {metricas['tiempo_min']:.4f} s")
+    print(f"Tiempo del nodo más lento: {metricas['tiempo_max']:.4f} s")
+    print(f"Tiempo promedio: {metricas['tiempo_promedio']:.4f} s")
+    print(f"Desbalance de carga: {metricas['desbalance']:.2f}%")
+    print(f"\nThroughput: {metricas['throughput']:,.0f} operaciones/segundo")
+    print(f"Ocupación de los nodos: {metricas['ocupacion']:.2f}%")
+    print(f"Resultado (suma de control): {metricas['resultado_total']:,}")
+    print("="*70)
+
+def guardar_metricas(metricas, nombre_base):
+    """Guarda las métricas en nombre_base.txt (legible) y nombre_base.json."""
+    with open(f"{nombre_base}.txt", 'w') as f:
+        f.write(f"MÉTRICAS DE {metricas['arquitectura'].upper()} - {metricas['nodos']} nodos\n")
+        f.write("="*70 + "\n")
+        f.write(f"Tiempo total: {metricas['tiempo_total']:.4f} s\n")
+        f.write(f"Throughput: {metricas['throughput']:,.0f} ops/s\n")
+        f.write(f"Ocupación: {metricas['ocupacion']:.2f}%\n")
+        f.write(f"Desbalance: {metricas['desbalance']:.2f}%\n")
+        f.write(f"\nTiempos por nodo:\n")
+        for i, t in enumerate(metricas["tiempos_por_nodo"]):
+            f.write(f"  Nodo {i}: {t:.4f} s\n")
+    with open(f"{nombre_base}.json", 'w') as f:
+        json.dump(metricas, f, indent=2)
+    print(f"\n✓ Métricas guardadas en '{nombre_base}.txt' y '{nombre_base}.json'")
+
+def cargar_metricas(ruta_json):
+    """Lee métricas guardadas con guardar_metricas; None si no existen."""
+    try:
+        with open(ruta_json) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
@@ -1,51 +1,60 @@
 """
 Script para comparar rendimiento entre ejecución single-node y cluster
+
+Ambos lados ejecutan la misma carga (carga_trabajo.py) y se miden igual:
+el tiempo es la ventana de cálculo que reporta cada ejecución en sus
+métricas, sin contar el arranque de intérpretes ni de mpiexec.
 """
 
 import subprocess
 import time
 import os
+import sys
+
+from carga_trabajo import N_TOTAL, cargar_metricas
+from comparar_cluster import calcular_single_node
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
 
 def ejecutar_single_node():
-    """Ejecuta la versión multihilo en un solo nodo"""
-    print("\n" + "="*70)
-    print("EJECUTANDO: SINGLE NODE (Multihilo)")
-    print("="*70)
-    
-    # Ejecutar el script de mandelbrot multihilo de Parte1
-    inicio = time.time()
-    resultado = subprocess.run(
-        ['python3', '../Parte1/mandelbrot_multihilo_color.py'],
-        capture_output=True,
-        text=True
-    )
-    fin = time.time()
+    """
+    Ejecuta la carga en un solo nodo con 1 proceso (referencia del speedup).
     
-    tiempo = fin - inicio
-    print(resultado.stdout)
-    
-    return tiempo
+    Usa el pool persistente de comparar_cluster, que se crea y calienta
+    antes de medir (igual que el Barrier inicial del clúster), así el
+    tiempo no incluye el arranque de intérpretes ni las importaciones.
+    """
+    metricas = calcular_single_node(N_TOTAL, 1)
+    return metricas["tiempo_total"]
 
 def ejecutar_cluster(num_nodos):
-    """Ejecuta la versión MPI con múltiples nodos simulados"""
+    """
+    Ejecuta la versión MPI con múltiples nodos simulados.
+    Devuelve el tiempo que el clúster guarda en 'metricas_cluster.json'.
+    """
     print("\n" + "="*70)
     print(f"EJECUTANDO: CLÚSTER ({num_nodos} nodos)")
     print("="*70)
     
-    inicio = time.time()
+    ruta_metricas = os.path.join(DIRECTORIO, 'metricas_cluster.json')
+    if os.path.exists(ruta_metricas):
+        os.remove(ruta_metricas)  # no leer métricas de una ejecución anterior
+    
     resultado = subprocess.run(
-        ['mpiexec', '-n', str(num_nodos), 'python3', 'mandelbrot_cluster_mpi.py'],
+        ['mpiexec', '-n', str(num_nodos), sys.executable, 'mandelbrot_cluster_mpi.py'],
         capture_output=True,
-        text=True
+        text=True,
+        cwd=DIRECTORIO
     )
-    fin = time.time()
     
-    tiempo = fin - inicio
     print(resultado.stdout)
     if resultado.stderr:
         print("STDERR:", resultado.stderr)
     
-    return tiempo
+    metricas = cargar_metricas(ruta_metricas)
+    if metricas is None:
+        raise RuntimeError("el clúster no generó 'metricas_cluster.json'")
+    return metricas["tiempo_total"]
 
 def main():
     print("\n" + "="*70)
@@ -54,7 +63,7 @@ def main():
     
     # Probar con diferentes configuraciones de clúster
     configuraciones = [
-        ("Single Node", 1, ejecutar_single_node),
+        ("Single Node (1 proceso)", 1, ejecutar_single_node),
         ("Clúster 2 nodos", 2, lambda: ejecutar_cluster(2)),
         ("Clúster 4 nodos", 4, lambda: ejecutar_cluster(4)),
         ("Clúster 8 nodos", 8, lambda: ejecutar_cluster(8)),
@@ -64,10 +73,7 @@ def main():
     
     for nombre, num_nodos, funcion in configuraciones:
         try:
-            if "Single" in nombre:
-                tiempo = funcion()
-            else:
-                tiempo = funcion()
+            tiempo = funcion()
             resultados.append((nombre, num_nodos, tiempo))
         except Exception as e:
             print(f"\n⚠️  Error ejecutando {nombre}: {e}")
@@ -88,7 +94,7 @@ def main():
         if tiempo:
             speedup = tiempo_base / tiempo
             eficiencia = (speedup / nodos) * 100
-            print(f"{nombre:<25} {nodos:<8} {tiempo:<12.2f} {speedup:<10.2f}x {eficiencia:<12.1f}%")
+            print(f"{nombre:<25} {nodos:<8} {tiempo:<12.4f} {f'{speedup:.2f}x':<10} {f'{eficiencia:.1f}%':<12}")
         else:
             print(f"{nombre:<25} {nodos:<8} {'ERROR':<12} {'-':<10} {'-':<12}")
     
@@ -97,7 +103,7 @@ def main():
     # Análisis
     print("\nANÁLISIS:")
     print("-"*70)
-    print("Speedup: Aceleración respecto a single node")
+    print("Speedup: Aceleración respecto a single node con 1 proceso (misma carga)")
     print("Eficiencia: Qué tan bien se aprovecha cada nodo adicional")
     print("\nIdeal: Eficiencia cercana a 100% indica paralelización perfecta")
     print("Real: Eficiencia < 100% debido a overhead de comunicación MPI")
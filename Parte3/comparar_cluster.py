@@ -1,78 +1,142 @@
 """
 Script para comparar rendimiento:
-- Single Node (multihilo)
+- Single Node (pool de procesos)
 - Clúster distribuido (MPI)
+
+La línea base single-node ejecuta el mismo kernel que los scripts MPI
+(carga_trabajo.calcular_subtarea) con el mismo particionado, en un pool de
+procesos que escriben sus resultados en memoria compartida. Las métricas
+usan el mismo esquema, así que speedup y eficiencia frente al clúster son
+medidas reales del mismo trabajo.
+
+Uso:
+    python3 comparar_cluster.py [NUM_PROCESOS]
+    mpirun -n NUM_PROCESOS python3 cluster_mpi.py
+    python3 comparar_cluster.py [NUM_PROCESOS]   # muestra ya la comparación
 """
-import threading
+import atexit
+import multiprocessing as mp
+import os
+import sys
 import time
 
-def calcular_single_node(n_total, num_hilos):
+from carga_trabajo import (N_TOTAL, particionar, calcular_subtarea, calcular_metricas,
+                           imprimir_metricas, guardar_metricas, cargar_metricas)
+
+# Arrays compartidos del pool (uno por proceso del pool, heredados al crearlo)
+_tiempos = None
+_resultados = None
+
+# Pools persistentes: num_procesos -> (pool, tiempos, resultados)
+_pools = {}
+
+def _inicializar(tiempos, resultados):
+    global _tiempos, _resultados
+    _tiempos = tiempos
+    _resultados = resultados
+
+def _listo(_):
+    """Tarea vacía: asegura que todos los procesos arrancaron antes de medir."""
+    return os.getpid()
+
+def _procesar_parte(parte, num_partes, n_total):
+    """Trabajo de un proceso: su rango del kernel, resultado en memoria compartida."""
+    tiempo_local, conteo = calcular_subtarea(*particionar(n_total, num_partes, parte))
+    _tiempos[parte] = tiempo_local
+    _resultados[parte] = conteo
+
+def obtener_pool(num_procesos):
+    """
+    Devuelve el pool persistente de num_procesos con sus arrays compartidos,
+    creándolo y calentándolo la primera vez. Llamadas posteriores reutilizan
+    los mismos procesos.
+    """
+    if num_procesos not in _pools:
+        tiempos = mp.RawArray('d', num_procesos)
+        resultados = mp.RawArray('q', num_procesos)
+        pool = mp.Pool(num_procesos, initializer=_inicializar, initargs=(tiempos, resultados))
+        # Equivalente al Barrier inicial del clúster: el arranque no se mide
+        pool.map(_listo, range(num_procesos))
+        _pools[num_procesos] = (pool, tiempos, resultados)
+    return _pools[num_procesos]
+
+def _cerrar_pools():
+    for pool, _, _ in _pools.values():
+        pool.close()
+        pool.join()
+    _pools.clear()
+
+atexit.register(_cerrar_pools)
+
+def calcular_single_node(n_total, num_procesos):
     """
-    Versión single-node usando múltiples hilos.
-    Simula el mismo trabajo que el clúster pero en una máquina.
+    Versión single-node usando el pool persistente de num_procesos.
+    Ejecuta el mismo trabajo que el clúster pero en una máquina.
     """
     print(f"\n{'='*70}")
-    print(f"EJECUTANDO: SINGLE NODE ({num_hilos} hilos)")
+    print(f"EJECUTANDO: SINGLE NODE ({num_procesos} procesos)")
     print(f"{'='*70}")
-    
-    # Dividir trabajo entre hilos
-    resultados = [0] * num_hilos
-    
-    def tarea(id_hilo, n_por_hilo):
-        inicio = time.time()
-        conteo = 0
-        for _ in range(n_por_hilo):
-            conteo += 1
-        fin = time.time()
-        resultados[id_hilo] = fin - inicio
-    
-    inicio_total = time.time()
-    
-    # Crear hilos
-    hilos = []
-    n_por_hilo = n_total // num_hilos
-    for i in range(num_hilos):
-        h = threading.Thread(target=tarea, args=(i, n_por_hilo))
-        hilos.append(h)
-        h.start()
-    
-    # Esperar que terminen
-    for h in hilos:
-        h.join()
-    
-    fin_total = time.time()
-    tiempo_total = fin_total - inicio_total
-    
-    # Mostrar resultados
-    print(f"\n{'Hilo':<10} {'Tiempo (s)':<15}")
-    print(f"{'-'*70}")
-    for i, t in enumerate(resultados):
-        print(f"{i:<10} {t:<15.4f}")
-    
-    print(f"{'-'*70}")
-    print(f"TIEMPO TOTAL SINGLE NODE: {tiempo_total:.4f}s")
-    print(f"Throughput: {n_total/tiempo_total:,.0f} iteraciones/segundo")
-    print(f"{'='*70}\n")
-    
-    return tiempo_total
+
+    pool, tiempos, resultados = obtener_pool(num_procesos)
+
+    inicio_total = time.perf_counter()
+    pool.starmap(_procesar_parte,
+                 [(parte, num_procesos, n_total) for parte in range(num_procesos)],
+                 chunksize=1)
+    tiempo_total = time.perf_counter() - inicio_total
+
+    metricas = calcular_metricas("single node", n_total, tiempo_total, list(tiempos), list(resultados))
+    imprimir_metricas(metricas)
+    return metricas
+
+def mostrar_comparacion(configuraciones):
+    """Tabla de speedup y eficiencia respecto a 1 proceso single-node."""
+    base = configuraciones[0][1]
+    print("\n" + "="*70)
+    print("RESULTADOS COMPARATIVOS")
+    print("="*70)
+    print(f"{'Configuración':<25} {'Nodos':<8} {'Tiempo (s)':<12} {'Speedup':<10} {'Eficiencia':<12}")
+    print("-"*70)
+    for nombre, metricas in configuraciones:
+        speedup = base["tiempo_total"] / metricas["tiempo_total"]
+        eficiencia = speedup / metricas["nodos"] * 100
+        print(f"{nombre:<25} {metricas['nodos']:<8} {metricas['tiempo_total']:<12.4f} "
+              f"{f'{speedup:.2f}x':<10} {f'{eficiencia:.1f}%':<12}")
+    print("="*70)
+
+    sumas = {m["resultado_total"] for _, m in configuraciones}
+    if len(sumas) > 1:
+        print("⚠️  Las sumas de control no coinciden: las ejecuciones no hicieron el mismo trabajo")
 
 if __name__ == "__main__":
-    # Misma carga que el clúster
-    n_total = 50_000_000
-    num_hilos = 4  # Mismo número que nodos del clúster
-    
+    # Debe coincidir con el número de nodos del clúster (mpirun -n): python3 comparar_cluster.py 4
+    num_procesos = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+
     print("\n" + "="*70)
     print("COMPARACIÓN: SINGLE NODE vs CLÚSTER")
     print("="*70)
-    print(f"\nCarga total: {n_total:,} iteraciones")
-    print(f"División del trabajo: {num_hilos} partes\n")
-    
-    # Ejecutar versión single node
-    tiempo_single = calcular_single_node(n_total, num_hilos)
-    
-    print("\nPara comparar con el clúster:")
-    print(f"1. Ejecuta: mpirun -n {num_hilos} python3 cluster_mpi.py")
-    print(f"2. Compara el tiempo del clúster vs single node ({tiempo_single:.4f}s)")
-    print(f"\nSpeedup = Tiempo Single Node / Tiempo Clúster")
-    print(f"Eficiencia = (Speedup / {num_hilos}) * 100%")
+    print(f"\nCarga total: {N_TOTAL:,} operaciones")
+    print(f"División del trabajo: {num_procesos} partes\n")
+
+    # Referencia secuencial (1 proceso) y línea base paralela single-node
+    metricas_uno = calcular_single_node(N_TOTAL, 1)
+    metricas_single = calcular_single_node(N_TOTAL, num_procesos)
+    guardar_metricas(metricas_single, "metricas_single_node")
+
+    configuraciones = [
+        ("Single node (1 proceso)", metricas_uno),
+        (f"Single node ({num_procesos} procesos)", metricas_single),
+    ]
+
+    metricas_cluster = cargar_metricas("metricas_cluster.json")
+    if metricas_cluster and metricas_cluster.get("n_total") == N_TOTAL:
+        configuraciones.append((f"Clúster ({metricas_cluster['nodos']} nodos)", metricas_cluster))
+    else:
+        print("\nPara comparar con el clúster:")
+        print(f"1. Ejecuta: mpirun -n {num_procesos} python3 cluster_mpi.py")
+        print(f"2. Vuelve a ejecutar este script: leerá 'metricas_cluster.json'")
+
+    mostrar_comparacion(configuraciones)
+    print(f"\nSpeedup = Tiempo 1 proceso / Tiempo de la configuración")
+    print(f"Eficiencia = (Speedup / Nodos) * 100%")
     print("\n" + "="*70)
@@ -1,118 +1,74 @@
 """
 Implementación de cómputo distribuido usando MPI (Message Passing Interface)
 Simula un clúster con múltiples nodos procesando en paralelo
+
+El kernel, el particionado y las métricas vienen de carga_trabajo.py, los
+mismos que usa la línea base single-node de comparar_cluster.py.
 """
 
 from mpi4py import MPI
-import time
+import os
 import sys
 
-def calcular_subtarea(n, rank, size):
-    """
-    Cada nodo procesa su parte del trabajo total
-    """
-    inicio = time.time()
-    
-    # Dividir trabajo equitativamente
-    elementos_por_nodo = n // size
-    inicio_rango = rank * elementos_por_nodo
-    fin_rango = inicio_rango + elementos_por_nodo
-    
-    # Simulación de procesamiento intensivo
-    conteo = 0
-    for i in range(inicio_rango, fin_rango):
-        conteo += (i % 1000)  # Operación simple para simular carga
-    
-    fin = time.time()
-    tiempo_local = fin - inicio
-    
-    return tiempo_local, conteo
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Parte1'))
+import traza
+from carga_trabajo import (N_TOTAL, particionar, calcular_subtarea,
+                           calcular_metricas, imprimir_metricas, guardar_metricas)
 
 def main():
     # Inicializar MPI
     comm = MPI.COMM_WORLD
     rank = comm.Get_rank()  # ID del nodo actual (0, 1, 2, ...)
     size = comm.Get_size()  # Número total de nodos
-    
-    # Carga de trabajo total
-    N_TOTAL = 100_000_000  # 100 millones de operaciones
-    
+
     if rank == 0:
         print("="*70)
         print(f"EJECUCIÓN EN CLÚSTER DISTRIBUIDO")
         print("="*70)
         print(f"Nodos activos: {size}")
         print(f"Carga total: {N_TOTAL:,} operaciones")
-        print(f"Carga por nodo: {N_TOTAL // size:,} operaciones")
+        print(f"Carga por nodo: ~{N_TOTAL // size:,} operaciones")
         print("="*70)
         print(f"\nIniciando procesamiento distribuido...\n")
-    
+
+    # Traza opcional: cada rank aparece como un proceso en la línea de tiempo
+    traza.configurar_proceso(f"Rank {rank}", pid=rank)
+
     # Sincronizar todos los nodos antes de empezar
-    comm.Barrier()
+    with traza.tramo("Barrier inicial", "mpi"):
+        comm.Barrier()
     tiempo_inicio_global = MPI.Wtime()
-    
+
     # Cada nodo procesa su parte
-    tiempo_local, resultado_local = calcular_subtarea(N_TOTAL, rank, size)
-    
+    with traza.tramo("calcular_subtarea", "calculo", rank=rank):
+        tiempo_local, resultado_local = calcular_subtarea(*particionar(N_TOTAL, size, rank))
+
     # Nodo maestro recolecta todos los tiempos
-    todos_los_tiempos = comm.gather(tiempo_local, root=0)
-    todos_los_resultados = comm.gather(resultado_local, root=0)
-    
+    with traza.tramo("gather tiempos", "mpi"):
+        todos_los_tiempos = comm.gather(tiempo_local, root=0)
+    with traza.tramo("gather resultados", "mpi"):
+        todos_los_resultados = comm.gather(resultado_local, root=0)
+
     # Sincronizar para medir tiempo total
-    comm.Barrier()
+    with traza.tramo("Barrier final", "mpi"):
+        comm.Barrier()
     tiempo_fin_global = MPI.Wtime()
-    
-    # Solo el nodo maestro imprime resultados
+
+    # Reunir las trazas de todos los ranks en el maestro (fuera de la medición)
+    if traza.esta_activa():
+        eventos_por_rank = comm.gather(traza.recolectar(), root=0)
+        if rank == 0:
+            for eventos in eventos_por_rank:
+                traza.incorporar(eventos)
+            traza.exportar_si_activa("traza_cluster.json")
+
+    # Solo el nodo maestro imprime y guarda resultados
     if rank == 0:
         tiempo_total = tiempo_fin_global - tiempo_inicio_global
-        
-        print("="*70)
-        print("RESULTADOS POR NODO")
-        print("="*70)
-        print(f"{'Nodo':<8} {'Tiempo (s)':<15} {'Operaciones':<15} {'Ops/seg':<15}")
-        print("-"*70)
-        
-        for i, (t, ops) in enumerate(zip(todos_los_tiempos, todos_los_resultados)):
-            ops_por_seg = (N_TOTAL // size) / t if t > 0 else 0
-            print(f"{i:<8} {t:<15.4f} {N_TOTAL // size:<15,} {ops_por_seg:<15,.0f}")
-        
-        print("-"*70)
-        
-        # Métricas de rendimiento
-        tiempo_max = max(todos_los_tiempos)
-        tiempo_min = min(todos_los_tiempos)
-        tiempo_promedio = sum(todos_los_tiempos) / len(todos_los_tiempos)
-        desbalance = ((tiempo_max - tiempo_min) / tiempo_promedio) * 100
-        
-        print(f"\nTiempo total de ejecución: {tiempo_total:.4f} s")
-        print(f"Tiempo del nodo más rápido: {tiempo_min:.4f} s")
-        print(f"Tiempo del nodo más lento: {tiempo_max:.4f} s")
-        print(f"Tiempo promedio: {tiempo_promedio:.4f} s")
-        print(f"Desbalance de carga: {desbalance:.2f}%")
-        
-        # Throughput del clúster
-        throughput = N_TOTAL / tiempo_total
-        print(f"\nThroughput del clúster: {throughput:,.0f} operaciones/segundo")
-        
-        # Eficiencia (comparado con ejecución teórica perfecta)
-        eficiencia = (tiempo_promedio * size) / tiempo_total * 100
-        print(f"Eficiencia de paralelización: {eficiencia:.2f}%")
-        
-        print("="*70)
-        
-        # Guardar métricas en archivo
-        with open('metricas_cluster.txt', 'w') as f:
-            f.write(f"MÉTRICAS DE CLÚSTER - {size} nodos\n")
-            f.write("="*70 + "\n")
-            f.write(f"Tiempo total: {tiempo_total:.4f} s\n")
-            f.write(f"Throughput: {throughput:,.0f} ops/s\n")
-            f.write(f"Eficiencia: {eficiencia:.2f}%\n")
-            f.write(f"Desbalance: {desbalance:.2f}%\n")
-            f.write(f"\nTiempos por nodo:\n")
-            for i, t in enumerate(todos_los_tiempos):
-                f.write(f"  Nodo {i}: {t:.4f} s\n")
-        
-        print("\n✓ Métricas guardadas en 'metricas_cluster.txt'")
+        metricas = calcular_metricas("cluster", N_TOTAL, tiempo_total,
+                                     todos_los_tiempos, todos_los_resultados)
+        imprimir_metricas(metricas)
+        guardar_metricas(metricas, "metricas_cluster")
 
 if __name__ == "__main__":
     main()